@@ -1,25 +1,157 @@
+import hashlib
+import json
+import logging
 import os
-from typing import Tuple
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
+from playwright.sync_api import Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeout
 
 # Load environment variables once at module import time
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-def get_credentials() -> Tuple[str, str]:
-    """Retrieve Yoto credentials from env variables or prompt the user.
+# Browser storage (cookies, local storage) saved after a successful login and
+# reused on later runs to skip the login form. One file per account, see
+# ``state_path_for``.
+STATE_DIR = Path.home() / ".yoto"
+# Saved sessions older than this are ignored and a fresh login is done.
+STATE_MAX_AGE = 7 * 24 * 60 * 60
+
+
+def get_credentials() -> Tuple[str, Optional[str]]:
+    """Retrieve Yoto credentials from env variables, prompting for the email.
+
+    The password is not prompted for here: a cached session usually makes it
+    unnecessary, so ``login`` asks for it only when a login actually happens.
 
     Returns:
-        Tuple of (email, password).
+        Tuple of (email, password), where password is None if not set in env.
     """
 
     email = os.getenv("YOTO_EMAIL")
-    password = os.getenv("YOTO_PASSWORD")
+    password = os.getenv("YOTO_PASSWORD") or None
 
     if not email:
         email = input("Enter Yoto Email: ")
-    if not password:
-        password = input("Enter Yoto Password: ")
 
     return email, password
+
+
+@lru_cache(maxsize=None)
+def _prompt_password() -> str:
+    """Ask for the Yoto password once; later logins in the same run reuse it."""
+    return input("Enter Yoto Password: ")
+
+
+def state_path_for(email: str, state_dir: Path = STATE_DIR) -> Path:
+    """Return the session cache file for ``email``.
+
+    Files are keyed by a hash of the normalized email, so switching accounts
+    never reuses another account's session.
+    """
+    digest = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
+    return state_dir / f"state-{digest[:16]}.json"
+
+
+def _fresh_state_path(state_path: Path) -> Optional[Path]:
+    """Return ``state_path`` if it exists and is younger than ``STATE_MAX_AGE``."""
+    try:
+        age = time.time() - state_path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    return state_path if age < STATE_MAX_AGE else None
+
+
+def login(
+    page: Page,
+    email: str,
+    password: Optional[str],
+    *,
+    retry_hint: str,
+    state_dir: Path = STATE_DIR,
+) -> bool:
+    """Log in through the account page and cache the session in ``state_dir``.
+
+    If ``password`` is None the user is asked for it.
+
+    Returns:
+        True on success, False if the login did not complete (e.g. CAPTCHA).
+    """
+    if password is None:
+        password = _prompt_password()
+
+    logger.info("Logging in...")
+    page.goto("https://us.yotoplay.com/my-account")
+    page.fill("input[name='username']", email)
+    page.fill("input[name='password']", password)
+    page.click("button[type='submit']")
+
+    try:
+        page.wait_for_url("**/my-account", timeout=60000)
+    except PlaywrightTimeout:
+        logger.warning(
+            "\n⚠️  Login taking too long. Possible CAPTCHA?\n"
+            "    Try running in visible mode to solve it manually:\n\n    %s\n",
+            retry_hint,
+        )
+        return False
+
+    _save_state(page.context.storage_state(), state_path_for(email, state_dir))
+    return True
+
+
+def _save_state(state: dict, state_path: Path) -> None:
+    """Write ``state`` to ``state_path`` so that only the current user can read it.
+
+    The file is created with mode 600 rather than chmod-ed after writing, so
+    the session cookies are never exposed under the process umask.
+    """
+    state_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(state_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    # The mode above only applies to new files; tighten an existing one too.
+    # os.fchmod is POSIX-only before Python 3.13, and modes are moot elsewhere.
+    if hasattr(os, "fchmod"):
+        os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+def load_or_login(
+    browser: Browser,
+    email: str,
+    password: Optional[str],
+    *,
+    retry_hint: str,
+    state_dir: Path = STATE_DIR,
+    **context_options,
+) -> Optional[BrowserContext]:
+    """Return a signed-in browser context, reusing the saved session if possible.
+
+    Args:
+        browser: Browser to create the context in.
+        email: Yoto account email; selects which cached session to reuse.
+        password: Yoto account password, used only if a login is needed. If
+            None, it is prompted for at that point.
+        retry_hint: Command suggested to the user if the login stalls.
+        state_dir: Where sessions are cached between runs.
+        **context_options: Extra options for ``browser.new_context``.
+
+    Returns:
+        The context, or None if a required login did not complete.
+    """
+    cached = _fresh_state_path(state_path_for(email, state_dir))
+    if cached:
+        return browser.new_context(storage_state=cached, **context_options)
+
+    context = browser.new_context(**context_options)
+    page = context.new_page()
+    if not login(page, email, password, retry_hint=retry_hint, state_dir=state_dir):
+        context.close()
+        return None
+    page.close()
+    return context
@@ -11,7 +11,7 @@ from typing import Optional
 import typer
 
 from . import __version__
-from .workflow import run_playwright
+from .workflow import configure_logging, run_playwright
 
 
 app = typer.Typer(help="CLI helper for uploading audio to Yoto 'My Cards'.")
@@ -38,37 +38,44 @@ def _print_version(value: Optional[bool]) -> None:
 
 @app.command()
 def upload(
-    playlist: str = typer.Option(
-        "", "--playlist", "-p", help="Playlist name (will be asked if omitted)."
+    playlist: Optional[str] = typer.Option(
+        None, "--playlist", "-p", help="Playlist name (will be asked if omitted)."
     ),
-    folder: str = typer.Option(
-        "",
+    folder: Optional[str] = typer.Option(
+        None,
         "--folder",
         "-f",
         help="Folder containing audio files (will be asked if omitted).",
     ),
-    chunk_size: int = typer.Option(
-        3,
+    chunk_size: Optional[int] = typer.Option(
+        None,
         "--chunk-size",
         min=1,
-        help="Number of files to upload per batch.",
+        help="Number of files to upload per batch (default: YOTO_CHUNK_SIZE or 50).",
     ),
     # INVERTED LOGIC: Default is headless=True (hidden). Flag is --visible.
     visible: bool = typer.Option(
         False,
-        "--visible",
+        "--visible/--headless",
         help="Run browser in visible mode (default is headless).",
     ),
+    then_randomize: bool = typer.Option(
+        False,
+        "--then-randomize",
+        help="Randomize track icons right after the playlist is created.",
+    ),
 ):
     """Upload all audio files in a folder into a new Yoto playlist."""
 
-    # For now we keep prompts inside the workflow; in future we can wire
-    # these options to skip interactive inputs.
-    _ = playlist
-    _ = folder
-    
     # run_playwright expects 'headless', so visible=True -> headless=False
-    run_playwright(target_url=None, chunk_size=chunk_size, headless=not visible)
+    run_playwright(
+        target_url=None,
+        playlist_name=playlist,
+        folder=folder,
+        chunk_size=chunk_size,
+        headless=not visible,
+        then_randomize=then_randomize,
+    )
 
 
 @app.command()
@@ -76,7 +83,7 @@ def icons(
     url: str = typer.Argument(..., help="Yoto playlist edit URL (…/card/XXXXX/edit)."),
     visible: bool = typer.Option(
         False,
-        "--visible",
+        "--visible/--headless",
         help="Run browser in visible mode (default is headless).",
     ),
 ):
@@ -86,4 +93,5 @@ def icons(
 
 
 def main() -> None:  # pragma: no cover - thin wrapper
+    configure_logging()
     app()
@@ -1,12 +1,18 @@
-from pathlib import Path
-from typing import Iterable, List
+import os
+from typing import List
 
 
-VALID_EXTENSIONS = {".mp3", ".m4a", ".wav", ".m4b"}
+VALID_EXTENSIONS = frozenset({".mp3", ".m4a", ".wav", ".m4b"})
 
 
-def get_valid_audio_files(folder_path: str) -> List[Path]:
-    """Return sorted list of valid audio files in the given folder.
+def _has_valid_extension(name: str) -> bool:
+    """Return True if ``name`` ends with one of ``VALID_EXTENSIONS``."""
+    stem, dot, ext = name.rpartition(".")
+    return bool(stem) and f"{dot}{ext.lower()}" in VALID_EXTENSIONS
+
+
+def get_valid_audio_files(folder_path: str) -> List[str]:
+    """Return sorted absolute paths of valid audio files in the given folder.
 
     Args:
         folder_path: Path to the folder to scan.
@@ -15,23 +21,24 @@ def get_valid_audio_files(folder_path: str) -> List[Path]:
         FileNotFoundError: If the folder does not exist.
 
     Returns:
-        List of Path objects sorted alphabetically.
+        List of absolute path strings sorted alphabetically by file name,
+        ready to hand to the browser's file input.
     """
-    path = Path(folder_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Folder not found: {folder_path}")
-
-    files = [
-        f
-        for f in path.iterdir()
-        if f.is_file() and f.suffix.lower() in VALID_EXTENSIONS
-    ]
-    files.sort(key=lambda x: x.name)
+    # Resolve the folder once; scandir then yields absolute entry paths.
+    # os.scandir reuses the file type reported by the directory listing, so
+    # checking the (cheap) extension first avoids a stat call per entry.
+    path = os.path.abspath(folder_path)
+    try:
+        with os.scandir(path) as it:
+            files = [
+                entry.path
+                for entry in it
+                if _has_valid_extension(entry.name) and entry.is_file()
+            ]
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Folder not found: {folder_path}") from None
+
+    # Every entry shares the same folder prefix, so this sorts by file name.
+    files.sort()
     return files
 
-
-def chunk_list(data: Iterable, size: int):
-    """Yield successive n-sized chunks from data."""
-    data_list = list(data)
-    for i in range(0, len(data_list), size):
-        yield data_list[i : i + size]
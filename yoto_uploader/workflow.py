@@ -4,37 +4,266 @@ This module contains the upload and icon-randomization flows that operate
 on a Playwright Page instance. It uses 'rich' for progress reporting.
 """
 
+import json
+import logging
+import os
+import random
+import re
 import sys
-import time
-from typing import Optional
-
-from playwright.sync_api import Page, sync_playwright
+from typing import List, Optional, Tuple
+
+from playwright.sync_api import (
+    BrowserContext,
+    Error as PlaywrightError,
+    Page,
+    Route,
+    TimeoutError as PlaywrightTimeout,
+    expect,
+    sync_playwright,
+)
+from rich.logging import RichHandler
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
 
-from .auth import get_credentials
-from .files import chunk_list, get_valid_audio_files
+from .auth import get_credentials, load_or_login, login
+from .files import get_valid_audio_files
+
+
+logger = logging.getLogger(__name__)
+
+# Files handed to the editor's upload input in a single call. The input
+# accepts any number of files, so this only matters if Yoto caps uploads.
+# Can be overridden with the YOTO_CHUNK_SIZE environment variable.
+DEFAULT_CHUNK_SIZE = 50
+
+# Number of chunks handed to the editor before waiting for them to register.
+# Can be overridden with the YOTO_UPLOAD_CONCURRENCY environment variable.
+DEFAULT_UPLOAD_CONCURRENCY = 4
+
+# Track icon shown for every track row in the playlist editor.
+CHOOSE_ICON_SELECTOR = "img.trackIcon[alt='Choose icon']"
+# Icon picker dialog. A closed picker may stay mounted, so only the visible
+# one is ever acted on (see OPEN_ICON_DIALOG_SELECTOR).
+ICON_DIALOG_SELECTOR = "div[role='dialog']:has(img.trackIcon)"
+OPEN_ICON_DIALOG_SELECTOR = f"{ICON_DIALOG_SELECTOR} >> visible=true"
+# Create/Update button of the playlist editor, enabled once tracks are ready.
+CREATE_BUTTON_SELECTOR = "button.create-btn"
+
+# Status text the editor shows while the server is still working on tracks.
+PROCESSING_SELECTOR = "text=/processing|transcoding|analyzing/i"
+
+# Chromium flags that keep a headless/background browser running at full speed.
+BROWSER_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-renderer-backgrounding",
+    "--disable-background-timer-throttling",
+    # Exposes window.gc so collect_garbage can free detached DOM nodes.
+    "--js-flags=--expose-gc",
+]
+
+# Icons assigned between garbage-collection hints in randomize_icons.
+GC_EVERY_ICONS = 10
+
+# Requests the upload flow never needs: images, fonts and media. Matched by
+# URL so that the upload requests themselves are never intercepted.
+_UPLOAD_BLOCKLIST = re.compile(
+    r"\.(?:png|jpe?g|gif|svg|webp|ico|woff2?|ttf|otf|mp4|webm)(?:[?#]|$)",
+    re.IGNORECASE,
+)
+
+# Third-party hosts neither flow needs: analytics, the cookie banner and web
+# fonts. Blocking the banner also makes its dismissal in randomize_icons a no-op.
+_THIRD_PARTY_BLOCKLIST = re.compile(
+    r"^https?://(?:[^/]*\.)?(?:google-analytics\.com|googletagmanager\.com"
+    r"|doubleclick\.net|(?:cdn-)?cookieyes\.com|fonts\.googleapis\.com|fonts\.gstatic\.com)"
+    r"(?:[:/]|$)",
+    re.IGNORECASE,
+)
+
+
+# Resolves to the src of every icon in the visible picker dialog, or null
+# while no picker is open yet. Hidden, still-mounted pickers are skipped.
+_DIALOG_SRCS_JS = """
+sel => {
+  const dialog = Array.from(document.querySelectorAll(sel))
+    .find(d => d.getClientRects().length);
+  if (!dialog) return null;
+  return Array.from(dialog.querySelectorAll('img.trackIcon'), e => e.getAttribute('src'));
+}
+"""
+# Scrolls a track icon clear of the sticky header (only if it is not already
+# comfortably in view) and returns its current src, in one round trip.
+_PREPARE_ICON_JS = """
+e => {
+  const r = e.getBoundingClientRect();
+  if (r.top < 150 || r.bottom > window.innerHeight) {
+    e.scrollIntoView({ block: 'center' });
+  }
+  return e.getAttribute('src');
+}
+"""
+
+# Keeps window.__yotoTrackCount equal to the number of track rows. A
+# MutationObserver only inspects the nodes each mutation adds or removes, so
+# the cost follows the changes rather than the size of the document. The set
+# of counted icons keeps nested or moved nodes from being counted twice.
+_TRACK_COUNTER_JS = f"""
+(() => {{
+  const sel = {json.dumps(CHOOSE_ICON_SELECTOR)};
+  const counted = new WeakSet();
+  const matches = n => n.nodeType === 1
+    ? (n.matches(sel) ? [n] : []).concat(Array.from(n.querySelectorAll(sel)))
+    : [];
+  window.__yotoTrackCount = 0;
+  new MutationObserver(records => {{
+    for (const r of records) {{
+      for (const n of r.addedNodes) for (const e of matches(n)) {{
+        if (e.isConnected && !counted.has(e)) {{ counted.add(e); window.__yotoTrackCount++; }}
+      }}
+      for (const n of r.removedNodes) for (const e of matches(n)) {{
+        if (!e.isConnected && counted.has(e)) {{ counted.delete(e); window.__yotoTrackCount--; }}
+      }}
+    }}
+  }}).observe(document, {{ subtree: true, childList: true }});
+}})();
+"""
+# How often (ms) wait_for_tracks re-reads the counter; it only reads a number.
+_TRACK_COUNT_POLL_MS = 250
 
 
 # ------------------- Low-level helpers -------------------
 
 
-def upload_chunk(page: Page, chunk_files, chunk_index: int) -> None:
-    """Handle the upload of a single chunk of files."""
-    from pathlib import Path
+def configure_logging(level: int = logging.INFO) -> None:
+    """Send the package's log messages to the console.
+
+    Uses rich's handler so messages render above any live progress bar
+    instead of breaking it.
+    """
+    package_logger = logging.getLogger("yoto_uploader")
+    if not package_logger.handlers:
+        package_logger.addHandler(
+            RichHandler(show_time=False, show_level=False, show_path=False)
+        )
+    package_logger.setLevel(level)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to ``default``."""
+    try:
+        value = int(os.getenv(name, ""))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def open_signed_in(
+    page: Page, url: str, email: str, password: Optional[str], *, retry_hint: str
+) -> bool:
+    """Navigate to ``url``, logging in again if the saved session was rejected.
+
+    If Yoto redirects away from ``my.yotoplay.com`` the session has expired
+    server-side, so we log in and retry the navigation once.
+    """
+    page.goto(url)
+    if page.url.startswith("https://my.yotoplay.com/"):
+        return True
+
+    if not login(page, email, password, retry_hint=retry_hint):
+        return False
+
+    page.goto(url)
+    return True
+
+
+def _abort_route(route: Route) -> None:
+    route.abort()
+
+
+def block_third_party(context: BrowserContext) -> None:
+    """Abort analytics, cookie banner and web font requests for every page."""
+    context.route(_THIRD_PARTY_BLOCKLIST, _abort_route)
+
+
+def block_upload_extras(page: Page) -> None:
+    """Abort image, font and media requests during the upload flow.
+
+    Undo with ``allow_upload_extras`` before anything that needs the icons.
+    """
+    page.route(_UPLOAD_BLOCKLIST, _abort_route)
+
+
+def allow_upload_extras(page: Page) -> None:
+    """Remove the route installed by ``block_upload_extras``."""
+    page.unroute(_UPLOAD_BLOCKLIST, _abort_route)
+
 
-    file_paths = [str(Path(f).absolute()) for f in chunk_files]
+def upload_chunk(page: Page, chunk_files: List[str], chunk_index: int) -> None:
+    """Hand a single chunk of files to the editor's upload input.
 
+    ``chunk_files`` are absolute paths as returned by ``get_valid_audio_files``.
+    This does not wait for the upload to finish; the caller decides how many
+    chunks may be in flight at once.
+    """
     try:
-        page.set_input_files("#upload", file_paths)
-    except Exception:  # noqa: BLE001
+        page.set_input_files("#upload", chunk_files)
+    except PlaywrightError:
         # Fallback if direct input fails
         with page.expect_file_chooser() as fc_info:
             page.click("label:has-text('Add audio')")
         file_chooser = fc_info.value
-        file_chooser.set_files(file_paths)
+        file_chooser.set_files(chunk_files)
+        # Release the input's remote handle instead of holding it all session
+        file_chooser.element.dispose()
+
+
+def collect_garbage(page: Page) -> None:
+    """Ask the page to run a JS garbage collection, if ``window.gc`` exists.
+
+    Long sessions otherwise keep detached track rows and dialog nodes around.
+    A no-op unless Chromium was launched with ``BROWSER_ARGS``.
+    """
+    try:
+        page.evaluate("() => { if (window.gc) window.gc(); }")
+    except PlaywrightError as e:
+        logger.debug("Garbage collection hint failed: %s", e)
+
+
+def count_tracks(page: Page) -> int:
+    """Return how many tracks the playlist editor currently lists."""
+    return page.locator(CHOOSE_ICON_SELECTOR).count()
+
 
-    # Wait a bit for the upload to actually register/start in the UI
-    time.sleep(10)
+def install_track_counter(page: Page) -> None:
+    """Install the track-row counter used by ``wait_for_tracks``.
+
+    Must be called before navigating to the editor; the script runs on every
+    document the page loads from then on.
+    """
+    page.add_init_script(_TRACK_COUNTER_JS)
+
+
+def wait_for_tracks(page: Page, expected: int, timeout: int = 180) -> bool:
+    """Wait until the editor lists at least ``expected`` tracks.
+
+    Relies on the counter from ``install_track_counter``, so this returns as
+    soon as the new track rows appear instead of after a fixed delay.
+
+    Returns:
+        True if the tracks appeared, False if the wait timed out.
+    """
+    try:
+        page.wait_for_function(
+            "n => (window.__yotoTrackCount || 0) >= n",
+            arg=expected,
+            polling=_TRACK_COUNT_POLL_MS,
+            timeout=timeout * 1000,
+        )
+    except PlaywrightTimeout:
+        logger.warning(
+            "Warning: Expected %d tracks, found %d. Continuing.", expected, count_tracks(page)
+        )
+        return False
+    return True
 
 
 def wait_and_create(page: Page, playlist_name: str, timeout: int = 600) -> str:
@@ -43,8 +272,6 @@ def wait_and_create(page: Page, playlist_name: str, timeout: int = 600) -> str:
     Since Yoto redirects to the library page instead of the edit page, we intercept
     the API call to `/content/mine` to find our new playlist ID.
     """
-    start_time = time.time()
-    
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -52,79 +279,103 @@ def wait_and_create(page: Page, playlist_name: str, timeout: int = 600) -> str:
     ) as progress:
         task = progress.add_task("Processing tracks...", total=None)
 
-        while time.time() - start_time < timeout:
-            # Check if Create button is enabled
-            if page.is_enabled("button.create-btn"):
-                progress.update(task, description="Processing complete. Creating playlist...")
-                
-                # Setup response listener BEFORE clicking
-                # We want to catch the response that lists all cards
-                with page.expect_response("**/content/mine", timeout=60000) as response_info:
-                    page.click("button.create-btn", force=True)
-                
-                progress.update(task, description="Waiting for playlist data...")
-                
-                # Get the JSON from the intercepted response
-                response = response_info.value
-                if not response.ok:
-                    raise RuntimeError(f"API request failed: {response.status} {response.url}")
-                
-                data = response.json()
-                # The API returns {"cards": [...]}
-                cards = data if isinstance(data, list) else data.get("cards", [])
-
-                # Find our card by TITLE (not name)
-                # Use case-insensitive matching to be robust
-                target_card = next(
-                    (c for c in cards if c.get("title", "").strip().lower() == playlist_name.strip().lower()), 
-                    None
-                )
+        # Targeted query for the status text instead of scanning page.content()
+        if page.locator(PROCESSING_SELECTOR).count():
+            progress.update(task, description="Server is transcoding/processing...")
 
-                if target_card:
-                    card_id = target_card.get("cardId")  # It is 'cardId', not 'id' based on the JSON sample
-                    if card_id:
-                        progress.stop()
-                        return f"https://my.yotoplay.com/card/{card_id}/edit"
-                
+        # The Create button is enabled once the server has processed every
+        # track. Playwright's auto-wait returns as soon as it flips, without
+        # Python-side polling or DOM serialization.
+        try:
+            expect(page.locator(CREATE_BUTTON_SELECTOR)).to_be_enabled(timeout=timeout * 1000)
+        except AssertionError:
+            # One-off diagnostic: report what the editor says it is doing
+            try:
+                status = page.locator(PROCESSING_SELECTOR).first.text_content(timeout=500)
+            except PlaywrightTimeout:
+                status = None
+            message = "Timed out waiting for processing to complete."
+            if status:
+                message += f" Last status: {status.strip()}"
+            raise TimeoutError(message) from None
+
+        progress.update(task, description="Processing complete. Creating playlist...")
+
+        # Setup response listener BEFORE clicking
+        # We want to catch the response that lists all cards
+        with page.expect_response("**/content/mine", timeout=60000) as response_info:
+            page.click(CREATE_BUTTON_SELECTOR, force=True)
+
+        progress.update(task, description="Waiting for playlist data...")
+
+        # Get the JSON from the intercepted response
+        response = response_info.value
+        if not response.ok:
+            raise RuntimeError(f"API request failed: {response.status} {response.url}")
+
+        data = response.json()
+        # The API returns {"cards": [...]}
+        cards = data if isinstance(data, list) else data.get("cards", [])
+
+        # Find our card by TITLE (not name)
+        # Use case-insensitive matching to be robust; the wanted title is
+        # normalized once and the scan stops at the first match.
+        wanted_title = playlist_name.strip().lower()
+        target_card = next(
+            (c for c in cards if (c.get("title") or "").strip().lower() == wanted_title),
+            None,
+        )
+
+        if target_card:
+            card_id = target_card.get("cardId")  # It is 'cardId', not 'id' based on the JSON sample
+            if card_id:
                 progress.stop()
-                print(f"Warning: Could not find card named '{playlist_name}' in API response.")
-                return "https://my.yotoplay.com/my-cards"
+                return f"https://my.yotoplay.com/card/{card_id}/edit"
+
+        progress.stop()
+        logger.warning("Warning: Could not find card named '%s' in API response.", playlist_name)
+        return "https://my.yotoplay.com/my-cards"
 
-            # Heuristic check for status text
-            try:
-                content = page.content().lower()
-                if any(w in content for w in ("processing", "transcoding", "analyzing")):
-                    progress.update(task, description="Server is transcoding/processing...")
-            except Exception:
-                pass
 
-            time.sleep(2)
+def plan_icon_assignments(catalog: List[str], count: int) -> List[str]:
+    """Pick ``count`` icons from ``catalog`` up front.
 
-    raise TimeoutError("Timed out waiting for processing to complete.")
+    Icons are unique until the catalog runs out, after which it is reshuffled
+    and reused.
+    """
+    if not catalog:
+        return []
+
+    assignments: List[str] = []
+    while len(assignments) < count:
+        assignments.extend(random.sample(catalog, min(len(catalog), count - len(assignments))))
+    return assignments
 
 
 def randomize_icons(page: Page) -> None:
     """Assign a random unique icon to each uploaded track."""
-    import random
-
     try:
         cookie_btn = page.locator("button.cky-btn-accept").first
         if cookie_btn.is_visible():
-            cookie_btn.click()
-            time.sleep(1)
-    except Exception:
+            cookie_btn.click(timeout=1000)
+            cookie_btn.wait_for(state="hidden", timeout=5000)
+    except PlaywrightError:
         pass
 
+    # Locators are built once and reused for every track
+    icon_locator = page.locator(CHOOSE_ICON_SELECTOR)
+    # Non-strict: matches the first visible picker even if a closed one lingers
+    open_dialog = page.locator(OPEN_ICON_DIALOG_SELECTOR).first
     try:
-        page.wait_for_selector("img.trackIcon[alt='Choose icon']", timeout=10000)
-    except Exception:
-        print("Warning: No icons found to update.")
+        icon_locator.first.wait_for(timeout=10000)
+    except PlaywrightTimeout:
+        logger.warning("Warning: No icons found to update.")
         return
 
-    icon_locator = page.locator("img.trackIcon[alt='Choose icon']")
     count = icon_locator.count()
     
-    used_icon_srcs = set()
+    # Planned on the first dialog open, since every track offers the same icons
+    assignments: Optional[List[str]] = None
 
     with Progress(
         TextColumn("[progress.description]{task.description}"),
@@ -135,7 +386,7 @@ def randomize_icons(page: Page) -> None:
 
         for i in range(count):
             if "/edit" not in page.url:
-                print(f"Error: Navigated away from editor! URL: {page.url}")
+                logger.error("Error: Navigated away from editor! URL: %s", page.url)
                 break
 
             progress.update(task, advance=0, description=f"Icon {i+1}/{count}")
@@ -143,203 +394,304 @@ def randomize_icons(page: Page) -> None:
             try:
                 # 1. Open dialog
                 icon = icon_locator.nth(i)
-                icon.scroll_into_view_if_needed()
-                page.evaluate("window.scrollBy(0, -150)")
-                time.sleep(0.5)
+                old_src = icon.evaluate(_PREPARE_ICON_JS)
 
+                # click() auto-waits for the icon to settle after scrolling
                 try:
                     icon.click(timeout=5000)
-                except Exception:
+                except PlaywrightTimeout:
                     icon.click(force=True)
 
-                target_dialog = "div[role='dialog']:has(img.trackIcon)"
-                page.wait_for_selector(target_dialog, state="visible", timeout=5000)
-
-                # 2. Pick icon
-                dialog_icons_sel = f"{target_dialog} img.trackIcon"
-                page.wait_for_selector(dialog_icons_sel, timeout=5000)
-                
-                available = page.query_selector_all(dialog_icons_sel)
-                if available:
-                    valid_opts = [
-                        (ico, ico.get_attribute("src")) 
-                        for ico in available 
-                        if ico.get_attribute("src") not in used_icon_srcs
-                    ]
-                    
-                    # Recycle if exhausted
-                    if not valid_opts:
-                        used_icon_srcs.clear()
-                        valid_opts = [
-                            (ico, ico.get_attribute("src")) for ico in available
-                        ]
-
-                    chosen_el, chosen_src = random.choice(valid_opts)
-                    if chosen_src:
-                        used_icon_srcs.add(chosen_src)
-                    
-                    chosen_el.click(force=True)
-                    page.wait_for_selector(target_dialog, state="hidden", timeout=5000)
-                else:
-                    page.keyboard.press("Escape")
-
-                time.sleep(1.0) # Short pause between icons
+                # 2. On the first dialog, wait for it and read every icon src
+                # in a single round trip to plan all assignments.
+                if assignments is None:
+                    srcs = page.wait_for_function(
+                        _DIALOG_SRCS_JS, arg=ICON_DIALOG_SELECTOR, timeout=5000
+                    ).json_value()
+                    catalog = list(dict.fromkeys(src for src in srcs if src))
+                    assignments = plan_icon_assignments(catalog, count)
+                    if not assignments:
+                        logger.warning("Warning: The icon picker offered no icons.")
+                        page.keyboard.press("Escape")
+                        break
+
+                # 3. Click the planned icon by src once the dialog is shown;
+                # later tracks need no separate read of the catalog.
+                chosen_src = assignments[i]
+                option = open_dialog.locator(
+                    f"img.trackIcon[src={json.dumps(chosen_src, ensure_ascii=False)}]"
+                )
+                open_dialog.wait_for(state="visible", timeout=5000)
+                option.first.click(force=True, timeout=5000)
+                open_dialog.wait_for(state="hidden", timeout=5000)
+
+                # The track shows the new icon once the editor has applied it
+                if chosen_src != old_src:
+                    expect(icon).not_to_have_attribute("src", old_src or "", timeout=5000)
+                logger.debug("Icon %d/%d: chose %s", i + 1, count, chosen_src)
+
                 progress.update(task, advance=1)
+                if (i + 1) % GC_EVERY_ICONS == 0:
+                    collect_garbage(page)
 
-            except Exception as e:
-                print(f"Failed to update icon {i+1}: {e}")
+            except (PlaywrightError, AssertionError) as e:
+                logger.error("Failed to update icon %d: %s", i + 1, e)
                 # Try recovery
                 try:
-                    if page.is_visible("div[role='dialog']:has(img.trackIcon)"):
+                    if open_dialog.is_visible():
                         page.keyboard.press("Escape")
-                except Exception:
+                except PlaywrightError:
                     pass
 
 
 # ------------------- High-level workflows -------------------
 
 
-def run_upload_mode(page: Page, email: str, password: str, *, chunk_size: int = 3) -> None:
-    """Upload mode: create a new playlist and upload all tracks."""
-    
-    from playwright.sync_api import TimeoutError as PlaywrightTimeout
+def collect_upload_inputs(
+    playlist_name: Optional[str] = None,
+    folder: Optional[str] = None,
+) -> Optional[Tuple[str, List[str]]]:
+    """Get the playlist name and audio folder, and list the files to upload.
 
-    print("\n=== UPLOAD MODE ===")
-    
-    # Inputs (interactive for now)
-    playlist_name = input("Enter playlist name: ").strip()
+    Values passed in (e.g. from the command line) are used as-is; only the
+    missing ones are asked for. Called before the browser starts, so nothing
+    is held in memory while the user is typing.
+
+    Returns:
+        Tuple of (playlist name, audio file paths), or None if there is
+        nothing to upload.
+    """
+    logger.info("\n=== UPLOAD MODE ===")
+
+    # Prompt only for inputs not given on the command line
+    playlist_name = (playlist_name or "").strip()
     while not playlist_name:
         playlist_name = input("Enter playlist name: ").strip()
 
-    folder_input = input("Enter path to audio folder: ").strip()
-    folder_input = folder_input.replace("'", "").replace('"', "")
-    
+    if folder is None:
+        # Paths dragged into a terminal arrive quoted; the shell has already
+        # unquoted a --folder value, so only the typed one is cleaned up.
+        folder_input = input("Enter path to audio folder: ").strip()
+        folder_input = folder_input.replace("'", "").replace('"', "")
+    else:
+        folder_input = folder.strip()
+
     try:
         audio_files = get_valid_audio_files(folder_input)
     except FileNotFoundError:
-        print(f"Error: Folder not found: {folder_input}")
-        return
+        logger.error("Error: Folder not found: %s", folder_input)
+        return None
 
     if not audio_files:
-        print("No valid audio files found.")
-        return
+        logger.warning("No valid audio files found.")
+        return None
 
-    chunks = list(chunk_list(audio_files, chunk_size))
-    
-    # Login
-    print("Logging in...")
-    page.goto("https://us.yotoplay.com/my-account")
-    page.fill("input[name='username']", email)
-    page.fill("input[name='password']", password)
-    page.click("button[type='submit']")
-    
-    try:
-        page.wait_for_url("**/my-account", timeout=60000)
-    except PlaywrightTimeout:
-        print("\n⚠️  Login taking too long. Possible CAPTCHA?")
-        print("    Try running in visible mode to solve it manually:")
-        print(f"\n    python3 -m yoto_uploader upload --visible\n")
-        return
+    return playlist_name, audio_files
+
+
+def run_upload_mode(
+    page: Page,
+    email: str,
+    password: Optional[str],
+    playlist_name: str,
+    audio_files: List[str],
+    *,
+    chunk_size: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+) -> Optional[str]:
+    """Upload mode: create a new playlist and upload all tracks.
+
+    ``playlist_name`` and ``audio_files`` come from ``collect_upload_inputs``.
 
-    print("Navigating to Playlist Editor...")
-    page.goto("https://my.yotoplay.com/card/edit")
+    Files are sent in chunks of at most ``chunk_size`` (one chunk for typical
+    playlists). Up to ``max_concurrency`` chunks are submitted back to back
+    before waiting for them to register, so the browser uploads them in
+    parallel. If a batch does not register in time the chunk size is halved
+    for the following batches, then doubled back after each batch that does.
+
+    Returns:
+        The new playlist's edit URL, or None if the upload did not start.
+    """
+    if chunk_size is None:
+        chunk_size = _env_int("YOTO_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    if max_concurrency is None:
+        max_concurrency = _env_int("YOTO_UPLOAD_CONCURRENCY", DEFAULT_UPLOAD_CONCURRENCY)
+
+    logger.info("Navigating to Playlist Editor...")
+    install_track_counter(page)
+    block_upload_extras(page)
+    if not open_signed_in(
+        page,
+        "https://my.yotoplay.com/card/edit",
+        email,
+        password,
+        retry_hint="python3 -m yoto_uploader upload --visible",
+    ):
+        return None
     
-    print(f"Setting playlist name: {playlist_name}")
+    logger.info("Setting playlist name: %s", playlist_name)
     page.fill("input[placeholder='Playlist name']", playlist_name)
     
     # Upload loop with progress
     with Progress(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
-        TextColumn("{task.completed}/{task.total} chunks"),
+        TextColumn("{task.completed}/{task.total} files"),
     ) as progress:
-        task = progress.add_task("Uploading chunks...", total=len(chunks))
-        
-        for i, chunk in enumerate(chunks, 1):
-            progress.update(task, description=f"Uploading chunk {i}/{len(chunks)}")
-            upload_chunk(page, chunk, i)
-            progress.update(task, advance=1)
+        task = progress.add_task("Uploading files...", total=len(audio_files))
+        expected_tracks = count_tracks(page)
+        size = chunk_size
+        pos = 0
+        chunk_index = 0
+
+        while pos < len(audio_files):
+            batch_start = pos
+            batch_base = expected_tracks
+            for _ in range(max_concurrency):
+                if pos >= len(audio_files):
+                    break
+                chunk = audio_files[pos : pos + size]
+                chunk_index += 1
+                progress.update(task, description=f"Uploading chunk {chunk_index}")
+                upload_chunk(page, chunk, chunk_index)
+                pos += len(chunk)
+                expected_tracks += len(chunk)
+
+            # Wait for the in-flight uploads to show up as tracks in the UI,
+            # backing off on a stall and growing again once the UI keeps up.
+            if wait_for_tracks(page, expected_tracks):
+                size = min(size * 2, chunk_size)
+            else:
+                # Resync with what the editor actually lists, so rows it
+                # rejected are not waited for again in every later batch.
+                # Only back off if most of the batch is missing; a few
+                # absent rows are a shortfall, not a slow editor.
+                expected_tracks = count_tracks(page)
+                if expected_tracks - batch_base < (pos - batch_start) / 2:
+                    size = max(1, size // 2)
+            collect_garbage(page)
+            progress.update(task, advance=pos - batch_start)
 
     # Wait and Auto-Create
     created_url = wait_and_create(page, playlist_name)
-    print(f"\n✅ Playlist created successfully!")
-    print(f"Edit URL: {created_url}")
-    print("You can use this URL to run the 'icons' command if you want to randomize icons later.")
+    logger.info(
+        "\n✅ Playlist created successfully!\n"
+        "Edit URL: %s\n"
+        "You can use this URL to run the 'icons' command if you want to randomize icons later.",
+        created_url,
+    )
+    allow_upload_extras(page)
+    return created_url
 
 
-def run_icon_mode(page: Page, email: str, password: str, edit_url: str) -> None:
+def run_icon_mode(page: Page, email: str, password: Optional[str], edit_url: str) -> None:
     """Icon mode: assign random icons to an existing playlist URL."""
-    from playwright.sync_api import TimeoutError as PlaywrightTimeout
-
-    print("\n=== ICON MODE ===")
-    print(f"Target URL: {edit_url}")
-    
-    print("Logging in...")
-    page.goto("https://us.yotoplay.com/my-account")
-    page.fill("input[name='username']", email)
-    page.fill("input[name='password']", password)
-    page.click("button[type='submit']")
-    
-    try:
-        page.wait_for_url("**/my-account", timeout=60000)
-    except PlaywrightTimeout:
-        print("\n⚠️  Login taking too long. Possible CAPTCHA?")
-        print("    Try running in visible mode to solve it manually:")
-        print(f"\n    python3 -m yoto_uploader icons \"{edit_url}\" --visible\n")
+    logger.info("\n=== ICON MODE ===")
+    logger.info("Target URL: %s", edit_url)
+
+    logger.info("Navigating to: %s", edit_url)
+    if not open_signed_in(
+        page,
+        edit_url,
+        email,
+        password,
+        retry_hint=f"python3 -m yoto_uploader icons \"{edit_url}\" --visible",
+    ):
         return
-
-    print(f"Navigating to: {edit_url}")
-    page.goto(edit_url)
     
     # Randomize
     randomize_icons(page)
     
     # Save changes
-    print("Saving changes...")
+    logger.info("Saving changes...")
     # Click "Update" (or Create/Save)
     # The button usually has class 'create-btn' but text might vary
     try:
         # Prefer specific text if possible, fallback to class
         if page.is_visible("button:has-text('Update')"):
             page.click("button:has-text('Update')", force=True)
-        elif page.is_enabled("button.create-btn"):
-            page.click("button.create-btn", force=True)
+        elif page.is_enabled(CREATE_BUTTON_SELECTOR):
+            page.click(CREATE_BUTTON_SELECTOR, force=True)
         
         page.wait_for_load_state("networkidle")
-    except Exception as e:
-        print(f"Warning: Could not automatically click Update/Save: {e}")
-        print("Please click it manually if needed.")
+    except PlaywrightError as e:
+        logger.warning(
+            "Warning: Could not automatically click Update/Save: %s\n"
+            "Please click it manually if needed.",
+            e,
+        )
     
-    print("\n✅ Icons updated.")
+    logger.info("\n✅ Icons updated.")
 
 
 def run_playwright(
     *,
     target_url: Optional[str] = None,
-    chunk_size: int = 3,
+    playlist_name: Optional[str] = None,
+    folder: Optional[str] = None,
+    chunk_size: Optional[int] = None,
     headless: bool = True,  # Default to TRUE (headless)
+    then_randomize: bool = False,
 ) -> None:
-    """Entry point that bootstraps Playwright."""
-    
+    """Entry point that bootstraps Playwright.
+
+    In upload mode, ``playlist_name`` and ``folder`` are asked for
+    interactively when not given. With ``then_randomize``, icons are
+    randomized right after a successful upload, reusing the same browser
+    session.
+    """
+
     email, password = get_credentials()
 
+    # Gather upload inputs before launching Chromium so the browser is not
+    # sitting idle while the user types.
+    upload_inputs = None
+    if not target_url:
+        upload_inputs = collect_upload_inputs(playlist_name, folder)
+        if upload_inputs is None:
+            return
+
+    if target_url:
+        retry_hint = f"python3 -m yoto_uploader icons \"{target_url}\" --visible"
+    else:
+        retry_hint = "python3 -m yoto_uploader upload --visible"
+
     with sync_playwright() as p:
-        print(f"Launching browser (Headless: {headless})...")
-        browser = p.chromium.launch(headless=headless)
-        context = browser.new_context(viewport={"width": 1920, "height": 1080})
-        page = context.new_page()
+        logger.info("Launching browser (Headless: %s)...", headless)
+        browser = p.chromium.launch(headless=headless, args=BROWSER_ARGS)
 
         try:
-            if target_url:
+            context = load_or_login(
+                browser,
+                email,
+                password,
+                retry_hint=retry_hint,
+                viewport={"width": 1920, "height": 1080},
+            )
+            if context is None:
+                return
+            block_third_party(context)
+            page = context.new_page()
+
+            if upload_inputs is None:
                 run_icon_mode(page, email, password, target_url)
             else:
-                run_upload_mode(page, email, password, chunk_size=chunk_size)
+                playlist_name, audio_files = upload_inputs
+                created_url = run_upload_mode(
+                    page, email, password, playlist_name, audio_files, chunk_size=chunk_size
+                )
+                if then_randomize and created_url:
+                    if "/edit" in created_url:
+                        run_icon_mode(page, email, password, created_url)
+                    else:
+                        logger.warning("Skipping icons: the new playlist's edit URL is unknown.")
         finally:
             browser.close()
 
 
 def main() -> None:
     """Legacy entry point."""
+    configure_logging()
     target_url = sys.argv[1] if len(sys.argv) > 1 else None
     # For legacy script usage, we default to VISIBLE to match old behavior?
     # Or match new default? Let's match new default (headless) but maybe print a note.